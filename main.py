@@ -1,47 +1,146 @@
 import os
+import pickle
 import tkinter as tk
 from tkinter import ttk, messagebox
 import sqlite3
+from contextlib import contextmanager
 import networkx as nx
+import numpy as np
+from scipy import optimize, sparse, spatial
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.collections import LineCollection
 from mpl_toolkits.mplot3d import Axes3D
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
 import random
+from collections import defaultdict
+
+# Numba is optional: when available, small and medium layouts run a compiled
+# Fruchterman-Reingold kernel instead of nx.spring_layout
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        return lambda f: f
+
+# Above this many nodes the layout switches from nx.spring_layout to L-BFGS
+LBFGS_LAYOUT_THRESHOLD = 500
+# Minimum interval between 3D rotation redraws while the mouse moves (~30 fps)
+ROTATE_FRAME_MS = 33
 
 # ---------- DATABASE SETUP ----------
-def init_db():
-    conn = sqlite3.connect("graph_data.db")
+def connect_db(path="graph_data.db"):
+    # One long-lived connection in autocommit mode; WAL + synchronous=NORMAL
+    # keeps each single-row write down to roughly one fsync
+    conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    conn.executescript("PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; "
+                       "PRAGMA busy_timeout=5000; PRAGMA temp_store=MEMORY;")
+    return conn
+
+def init_db(conn):
     c = conn.cursor()
     c.execute('''CREATE TABLE IF NOT EXISTS edges (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     source INTEGER,
                     target INTEGER
                 )''')
-    conn.commit()
-    conn.close()
+
+@contextmanager
+def transaction(conn):
+    # Explicit BEGIN/COMMIT around multi-row work so it pays for a single commit
+    # (the connection is otherwise in autocommit mode)
+    c = conn.cursor()
+    c.execute("BEGIN")
+    try:
+        yield c
+    except Exception:
+        c.execute("ROLLBACK")
+        raise
+    c.execute("COMMIT")
 
 # ---------- BACKEND HELPERS ----------
-def save_edge(u, v):
-    conn = sqlite3.connect("graph_data.db")
+def save_edge(conn, u, v):
     c = conn.cursor()
     c.execute("INSERT INTO edges (source, target) VALUES (?, ?)", (u, v))
-    conn.commit()
-    conn.close()
 
-def delete_edge(u, v):
-    conn = sqlite3.connect("graph_data.db")
+def save_edges_bulk(conn, pairs):
+    with transaction(conn) as c:
+        c.executemany("INSERT INTO edges (source, target) VALUES (?, ?)", pairs)
+
+def delete_edge(conn, u, v):
     c = conn.cursor()
     c.execute("DELETE FROM edges WHERE (source=? AND target=?) OR (source=? AND target=?)", (u, v, v, u))
-    conn.commit()
-    conn.close()
 
-def load_edges():
-    conn = sqlite3.connect("graph_data.db")
+def load_edges(conn):
     c = conn.cursor()
-    c.execute("SELECT source, target FROM edges")
-    edges = c.fetchall()
-    conn.close()
-    return edges
+    # only rows whose endpoints are stored as integers are loaded; NULL or
+    # non-numeric values are skipped rather than breaking the batch load
+    c.execute("SELECT source, target FROM edges "
+              "WHERE typeof(source) = 'integer' AND typeof(target) = 'integer'")
+    return c.fetchall()
+
+def save_graph_pickle(G, path="graph_data.gpickle"):
+    with open(path, "wb") as f:
+        pickle.dump(G, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+def load_graph_pickle(path="graph_data.gpickle", db_path="graph_data.db"):
+    # Fast startup path: the pickle is only trusted if it is newer than every
+    # DB file (a leftover -wal holds writes not yet checkpointed). Must run
+    # before the DB is opened, since opening it in WAL mode touches those files.
+    try:
+        pickle_mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    db_files = [p for p in (db_path, db_path + "-wal") if os.path.exists(p)]
+    if any(os.path.getmtime(p) >= pickle_mtime for p in db_files):
+        return None
+    try:
+        with open(path, "rb") as f:
+            G = pickle.load(f)
+    except Exception:
+        return None
+    return G if isinstance(G, nx.Graph) else None
+
+# ---------- LAYOUT KERNELS ----------
+@njit(parallel=True, fastmath=True, cache=True)
+def _fr_step(pos, edges, k, t):
+    # One Fruchterman-Reingold iteration: all-pairs repulsion k^2/d, attraction
+    # d^2/k along edges, then each node moves at most t along its displacement
+    n = pos.shape[0]
+    disp = np.zeros_like(pos)
+    for i in prange(n):
+        fx = 0.0
+        fy = 0.0
+        for j in range(n):
+            if i != j:
+                dx = pos[i, 0] - pos[j, 0]
+                dy = pos[i, 1] - pos[j, 1]
+                d2 = max(dx * dx + dy * dy, 1e-4)
+                f = k * k / d2
+                fx += dx * f
+                fy += dy * f
+        disp[i, 0] = fx
+        disp[i, 1] = fy
+    for e in range(edges.shape[0]):
+        u = edges[e, 0]
+        v = edges[e, 1]
+        dx = pos[u, 0] - pos[v, 0]
+        dy = pos[u, 1] - pos[v, 1]
+        f = max(np.sqrt(dx * dx + dy * dy), 0.01) / k
+        disp[u, 0] -= dx * f
+        disp[u, 1] -= dy * f
+        disp[v, 0] += dx * f
+        disp[v, 1] += dy * f
+    out = np.empty_like(pos)
+    for i in prange(n):
+        length = max(np.sqrt(disp[i, 0] ** 2 + disp[i, 1] ** 2), 0.01)
+        out[i, 0] = pos[i, 0] + disp[i, 0] * t / length
+        out[i, 1] = pos[i, 1] + disp[i, 1] * t / length
+    return out
 
 # ---------- MAIN APPLICATION ----------
 class GraphApp:
@@ -53,18 +152,51 @@ class GraphApp:
         self.root.minsize(1000, 650)
         self.root.config(bg="#0b0b15")
 
+        # A saved graph newer than the DB lets startup skip the SQL rebuild
+        cached_graph = load_graph_pickle()
+
+        # Persistent DB connection, closed when the window is closed
+        self.conn = connect_db()
+        init_db(self.conn)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
         # Graph model
         self.G = nx.Graph()
         self.next_node_id = 1
 
+        # Cached spring layout; recomputed only when the topology changes
+        self._pos_cache = None
+        self._pos_dirty = True
+        # Struct-of-arrays view of the cached layout: row i of _pos_soa holds
+        # nodes_sorted()[i] and _edge_rows holds each edge as a pair of rows
+        self._node_to_row = {}
+        self._pos_soa = np.empty((0, 2))
+        self._edge_rows = np.empty((0, 2), dtype=np.int32)
+
+        # Sorted node list shared by all views, rebuilt lazily after a mutation
+        self._nodes_sorted = None
+        # Degrees and |E| kept in step with add/remove so nothing has to walk
+        # the adjacency; nodes of degree 0 have no entry in _deg
+        self._deg = defaultdict(int)
+        self._edge_count = 0
+        # Odd-degree vertices; adding/removing edge u-v flips the parity of both
+        self._odd = set()
+
+        # 3D rotation: motion events only record the latest azimuth and at most
+        # one redraw is scheduled per frame interval
+        self._pending_azim = None
+        self._redraw_scheduled = False
+        self._canvas_width = 0
+
         # UI state
         self.src_var = tk.StringVar()
         self.tgt_var = tk.StringVar()
+        self._show_3d = tk.BooleanVar(value=True)
 
         self.setup_ui()
 
-        # Load persisted edges from DB and refresh UI
-        self.load_from_db()
+        # Load persisted edges from DB (or the saved graph) and refresh UI
+        self.load_from_db(cached_graph)
         self.refresh_graph()
 
     # ---------- UI SETUP ----------
@@ -109,6 +241,9 @@ class GraphApp:
                   command=self.save_graph).grid(row=0, column=1, padx=6)
         tk.Button(right_controls, text="🔄 Reset / Refresh", bg="#6a5acd", fg="white",
                   command=self.reset_graph).grid(row=0, column=2, padx=6)
+        tk.Checkbutton(right_controls, text="Show 3D", variable=self._show_3d, command=self.toggle_3d,
+                       bg="#0b0b15", fg="#cfefff", selectcolor="#1e1e2e",
+                       activebackground="#0b0b15").grid(row=0, column=3, padx=6)
 
         # Middle area: canvas and side panels
         middle = tk.Frame(self.root, bg="#0b0b15")
@@ -130,10 +265,26 @@ class GraphApp:
         self.ax3.set_facecolor("#0b0b15")
         self.ax1.axis("off")
 
+        # Degree histogram bars are created once and updated in place
+        self._bars = self.ax2.bar([], [], color="#00ffcc", edgecolor="#0b3f3f")
+        self.ax2.set_title("Degree Distribution", color="white")
+        self.ax2.tick_params(colors="white")
+
+        # 3D nodes and edges are likewise single artists whose data is swapped
+        # on refresh; depth shading is off so draws skip the RGBA recomputation
+        self._scatter3d = self.ax3.scatter([], [], [], s=140, depthshade=False, edgecolors='k')
+        self._edges3d = Line3DCollection([], colors='#74f7ff', alpha=0.6)
+        self.ax3.add_collection(self._edges3d, autolim=False)
+        self.ax3.set_title('3D View (move mouse to rotate)', color='#cfefff')
+        self.ax3.set_xticks([])
+        self.ax3.set_yticks([])
+        self.ax3.set_zticks([])
+
         self.canvas = FigureCanvasTkAgg(self.fig, master=canvas_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         # Bind mouse motion to rotate 3D view
         self.canvas.mpl_connect('motion_notify_event', self.on_mouse_move)
+        self.canvas.get_tk_widget().bind('<Configure>', self.on_canvas_configure, add='+')
 
         # Right: edge list, verification panel and log
         right_panel = tk.Frame(middle, width=340, bg="#0b0b15")
@@ -172,6 +323,7 @@ class GraphApp:
     def add_node(self):
         node_id = self.next_node_id
         self.G.add_node(node_id)
+        self._invalidate_cache()
         self.next_node_id = max(self.next_node_id, node_id + 1)
         self.log(f"🟢 Added Node {node_id}")
         self.update_node_selectors()
@@ -210,7 +362,9 @@ class GraphApp:
         # actually add edge to graph and persist
         if not self.G.has_edge(u, v):
             self.G.add_edge(u, v)
-            save_edge(u, v)
+            self._on_edge_added(u, v)
+            save_edge(self.conn, u, v)
+            self.edge_list.insert(tk.END, f"{u} - {v}")
             self.log(f"🔗 Added Edge {u}-{v} (saved in DB)")
         self.update_node_selectors()
         self.refresh_graph()
@@ -218,16 +372,17 @@ class GraphApp:
     def animate_edge(self, u, v, duration=700, steps=20, on_complete=None):
         """Animate an edge visually joining between nodes u and v.
 
-        This draws a temporary animated line on ax1 (2D) and ax3 (3D if nodes present),
-        then calls on_complete callback after animation finishes.
+        This blits a temporary animated line on ax1 (2D), then calls the
+        on_complete callback after animation finishes.
         duration in milliseconds.
         """
         try:
             # prepare positions
-            pos = nx.spring_layout(self.G, seed=42)
+            pos = self._get_pos()
             if u not in pos or v not in pos:
-                # fallback: refresh to compute positions then try again
-                pos = nx.spring_layout(self.G, seed=42)
+                # fallback: force a fresh layout then try again
+                self._pos_dirty = True
+                pos = self._get_pos()
         except Exception:
             pos = {}
 
@@ -235,16 +390,6 @@ class GraphApp:
         p_u = pos.get(u, (0.0, 0.0))
         p_v = pos.get(v, (0.0, 0.0))
 
-        # For 3D, approximate z as in refresh_graph
-        def z_of(p):
-            return (p[0] * p[1]) * 0.2
-
-        z_u = z_of(p_u)
-        z_v = z_of(p_v)
-
-        # create a Line2D and a 3D line (if needed)
-        animated_lines = []
-
         # Choose a colorful palette that transitions
         cmap = plt.cm.viridis
 
@@ -257,74 +402,93 @@ class GraphApp:
 
         step = {'i': 0}
 
-        # store original axes elements to redraw later
-        orig_nodes = None
+        # Blit only the growing 2D line: render the static figure once, keep
+        # ax1's background and repaint just that line on every frame. The 3D
+        # view can't be blitted, so the new edge shows up there on completion.
+        l2d, = self.ax1.plot([], [], linewidth=3, alpha=0.9, animated=True)
+        state = {'background': None}
+
+        # any full redraw during the animation (rotation, another refresh)
+        # invalidates the saved background, so grab a fresh one
+        def on_draw(event):
+            state['background'] = self.canvas.copy_from_bbox(self.ax1.bbox)
+
+        cid = self.canvas.mpl_connect('draw_event', on_draw)
+        self.canvas.draw()
+
+        def finish():
+            self.canvas.mpl_disconnect(cid)
+            try:
+                # final cleanup of the animated line (already gone if ax1 was cleared)
+                if l2d.axes is not None:
+                    l2d.remove()
+                self.canvas.draw_idle()
+            finally:
+                if on_complete:
+                    on_complete()
 
         def draw_step():
+            # ax1 was cleared mid-animation (e.g. by another refresh): stop
+            # animating but still commit the edge
+            if l2d.axes is None:
+                finish()
+                return
+
             t = (step['i'] + 1) / total
             # compute intermediate point
             xi = lerp(p_u[0], p_v[0], t)
             yi = lerp(p_u[1], p_v[1], t)
 
-            # color changes with t
-            col = cmap(t)
-
-            # draw on ax1: a line from u to intermediate point
-            # clear only the temporary lines (we'll remove previous animated lines)
-            for ln in animated_lines:
-                try:
-                    ln.remove()
-                except Exception:
-                    pass
-            animated_lines.clear()
-
-            # Draw partial line in 2D
-            l2d, = self.ax1.plot([p_u[0], xi], [p_u[1], yi], color=col, linewidth=3, alpha=0.9)
-            animated_lines.append(l2d)
-
-            # Draw partial line in 3D if axis has been set up
-            try:
-                l3d, = self.ax3.plot([p_u[0], xi], [p_u[1], yi], [z_u, lerp(z_u, z_v, t)], color=col, linewidth=2, alpha=0.9)
-                animated_lines.append(l3d)
-            except Exception:
-                pass
-
-            self.canvas.draw_idle()
+            # draw on ax1: a line from u to intermediate point, color changes with t
+            self.canvas.restore_region(state['background'])
+            l2d.set_data([p_u[0], xi], [p_u[1], yi])
+            l2d.set_color(cmap(t))
+            self.ax1.draw_artist(l2d)
+            self.canvas.blit(self.ax1.bbox)
 
             step['i'] += 1
             if step['i'] < total:
                 # schedule next frame
                 self.root.after(interval, draw_step)
             else:
-                # final cleanup of animated lines
-                for ln in animated_lines:
-                    try:
-                        ln.remove()
-                    except Exception:
-                        pass
-                self.canvas.draw_idle()
-                if on_complete:
-                    on_complete()
+                finish()
 
         # kick off animation
         draw_step()
 
+    def on_canvas_configure(self, event):
+        self._canvas_width = event.width
+
     def on_mouse_move(self, event):
         # Rotate 3D view based on mouse x position over the canvas
         if event.x is None or event.y is None:
             return
-        bbox = self.canvas.get_tk_widget().bbox()
-        try:
-            width = bbox[2]
-        except Exception:
-            width = self.canvas.get_tk_widget().winfo_width()
+        width = self._canvas_width
         if width <= 0:
             return
         rel = max(0.0, min(1.0, event.x / width))
-        azim = 360 * rel
-        self.ax3.view_init(elev=30, azim=azim)
+        self._pending_azim = 360 * rel
+        if not self._redraw_scheduled:
+            self._redraw_scheduled = True
+            self.root.after(ROTATE_FRAME_MS, self._do_rotate)
+
+    def _do_rotate(self):
+        self._redraw_scheduled = False
+        if self._pending_azim is None or not self._show_3d.get():
+            return
+        self.ax3.view_init(elev=30, azim=self._pending_azim)
         self.canvas.draw_idle()
 
+    def toggle_3d(self):
+        # The 3D axes are hidden and skipped by refresh_graph while unchecked
+        show = self._show_3d.get()
+        self.ax3.set_visible(show)
+        if show:
+            # bring the 3D view up to date with changes made while hidden
+            self.refresh_graph(graph=False, hist=False)
+        else:
+            self.canvas.draw_idle()
+
     def remove_edge(self):
         # Legacy random removal retained; prefer using remove_selected_edge
         if not self.G.edges:
@@ -332,7 +496,14 @@ class GraphApp:
             return
         u, v = random.choice(list(self.G.edges))
         self.G.remove_edge(u, v)
-        delete_edge(u, v)
+        self._on_edge_removed(u, v)
+        delete_edge(self.conn, u, v)
+        # the listbox row may be written either way round
+        rows = self.edge_list.get(0, tk.END)
+        for label in (f"{u} - {v}", f"{v} - {u}"):
+            if label in rows:
+                self.edge_list.delete(rows.index(label))
+                break
         self.log(f"❌ Removed Edge {u}-{v} (removed from DB)")
         self.update_node_selectors()
         self.refresh_graph()
@@ -352,15 +523,19 @@ class GraphApp:
             return
         if self.G.has_edge(u, v):
             self.G.remove_edge(u, v)
-        delete_edge(u, v)
+            self._on_edge_removed(u, v)
+        delete_edge(self.conn, u, v)
+        self.edge_list.delete(sel[0])
         self.log(f"❌ Removed Edge {u}-{v} (removed from DB)")
         self.update_node_selectors()
         self.refresh_graph()
 
     def verify_lemma(self):
-        degrees = [deg for _, deg in self.G.degree()]
+        # degrees and |E| are tracked incrementally, so this only sums a list
+        # of counter lookups rather than walking the adjacency
+        degrees = [self._deg.get(n, 0) for n in self.nodes_sorted()]
         degree_sum = sum(degrees)
-        edge_twice = 2 * self.G.number_of_edges()
+        edge_twice = 2 * self._edge_count
 
         # Update visible verification panel
         self.deg_label.config(text=f"Degrees: {degrees}")
@@ -374,138 +549,280 @@ class GraphApp:
             self.result_label.config(text=f"Status: ❌ Mismatch", fg="#ff6666")
             self.log("❌ Handshaking Lemma Failed!")
 
-        self.refresh_graph(highlight_odd=True)
+        # topology is unchanged, so only the graph view needs recoloring
+        self.refresh_graph(highlight_odd=True, hist=False, three_d=False)
 
     def euler_path_check(self):
-        odd_degree_nodes = [n for n, d in self.G.degree() if d % 2 != 0]
-        if len(odd_degree_nodes) == 0:
+        odd_count = len(self._odd)
+        if odd_count == 0:
             self.log("🔵 Euler Circuit exists (all degrees even).")
-        elif len(odd_degree_nodes) == 2:
+        elif odd_count == 2:
             self.log("🟣 Euler Path exists (two odd-degree vertices).")
         else:
-            self.log(f"🔴 No Euler Path/Circuit (odd-degree count: {len(odd_degree_nodes)})")
-        self.refresh_graph()
+            self.log(f"🔴 No Euler Path/Circuit (odd-degree count: {odd_count})")
 
     def save_graph(self):
-        nx.write_gpickle(self.G, "graph_data.gpickle")
+        # fold the WAL into the main DB file first so the pickle ends up newer
+        # than every DB file and is picked up on the next start
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        save_graph_pickle(self.G)
         self.log("💾 Graph saved successfully!")
 
-    def load_from_db(self):
-        # Load edges from sqlite DB and construct graph
-        edges = load_edges()
-        nodes = set()
-        for u, v in edges:
-            try:
-                uu = int(u)
-                vv = int(v)
-            except Exception:
-                continue
-            self.G.add_edge(uu, vv)
-            nodes.add(uu)
-            nodes.add(vv)
-        if nodes:
-            self.next_node_id = max(nodes) + 1
+    def load_from_db(self, cached_graph=None):
+        # Load edges from sqlite DB (or a fresh saved graph) and construct graph
+        if cached_graph is not None:
+            self.G.update(cached_graph)
+            source = "saved graph"
         else:
-            # start fresh
-            self.next_node_id = 1
+            # the query casts both columns, so rows can be added in one batch
+            self.G.add_edges_from(load_edges(self.conn))
+            source = "DB"
+        # rebuild the counters in one pass over the edges
+        self._deg = defaultdict(int)
+        for u, v in self.G.edges():
+            self._deg[u] += 1
+            self._deg[v] += 1
+        self._edge_count = self.G.number_of_edges()
+        self._odd = {n for n, d in self._deg.items() if d % 2}
+        self._invalidate_cache()
+        # start fresh at 1 when the graph is empty
+        self.next_node_id = max(self.G.nodes(), default=0) + 1
+        self._rebuild_edge_list()
         self.update_node_selectors()
-        self.log(f"📥 Loaded {self.G.number_of_edges()} edges from DB")
+        self.log(f"📥 Loaded {self.G.number_of_edges()} edges from {source}")
+
+    # ---------- CACHED GRAPH QUERIES ----------
+    def _invalidate_cache(self):
+        # call after any change to the graph's nodes or edges
+        self._pos_dirty = True
+        self._nodes_sorted = None
+
+    def _on_edge_added(self, u, v):
+        self._deg[u] += 1
+        self._deg[v] += 1
+        self._edge_count += 1
+        # a self-loop changes the degree by 2, leaving parity unchanged
+        if u != v:
+            self._odd.symmetric_difference_update((u, v))
+        self._invalidate_cache()
+
+    def _on_edge_removed(self, u, v):
+        for n in (u, v):
+            self._deg[n] -= 1
+            if self._deg[n] == 0:
+                del self._deg[n]
+        self._edge_count -= 1
+        # a self-loop changes the degree by 2, leaving parity unchanged
+        if u != v:
+            self._odd.symmetric_difference_update((u, v))
+        self._invalidate_cache()
+
+    def nodes_sorted(self):
+        if self._nodes_sorted is None:
+            self._nodes_sorted = sorted(self.G.nodes())
+        return self._nodes_sorted
 
     # ---------- GRAPH RENDER ----------
-    def refresh_graph(self, highlight_odd=False):
+    def _get_pos(self):
+        # Recompute the spring layout only after a topology change, warm-starting
+        # from the previous positions so a single added node/edge converges fast
+        if self._pos_dirty or self._pos_cache is None:
+            if len(self.G) > LBFGS_LAYOUT_THRESHOLD:
+                self._pos_cache = self._lbfgs_layout()
+            elif HAVE_NUMBA and len(self.G) > 0:
+                self._pos_cache = self._fr_layout()
+            else:
+                self._pos_cache = nx.spring_layout(self.G, seed=42, pos=self._pos_cache or None)
+            self._pos_dirty = False
+            self._build_pos_soa()
+        return self._pos_cache
+
+    def _build_pos_soa(self):
+        # Rebuilt with the layout, so renders slice ndarrays instead of
+        # looking up per-node tuples in the layout dict
+        nodes = self.nodes_sorted()
+        self._node_to_row = {n: i for i, n in enumerate(nodes)}
+        self._pos_soa = np.array([self._pos_cache[n] for n in nodes], dtype=float).reshape(-1, 2)
+        self._edge_rows = np.array([(self._node_to_row[u], self._node_to_row[v]) for u, v in self.G.edges()],
+                                   dtype=np.int32).reshape(-1, 2)
+
+    def _fr_layout(self, iterations=50):
+        """Fruchterman-Reingold layout driven by the compiled _fr_step kernel.
+
+        Warm-starts from the previous layout and cools the step size linearly
+        to zero. Returns a {node: (x, y)} mapping rescaled to [-1, 1].
+        """
+        nodes = list(self.G.nodes())
+        n = len(nodes)
+        k = 1.0 / np.sqrt(n)
+        row = {nd: i for i, nd in enumerate(nodes)}
+        edges = np.array([(row[u], row[v]) for u, v in self.G.edges()], dtype=np.int64).reshape(-1, 2)
+
+        rng = np.random.default_rng(42)
+        prev = self._pos_cache or {}
+        pos = np.array([prev[nd] if nd in prev else rng.random(2) for nd in nodes], dtype=float)
+
+        # initial temperature is a tenth of the layout's extent, as in networkx
+        t = max(pos.max(axis=0) - pos.min(axis=0)) * 0.1 or 0.1
+        dt = t / (iterations + 1)
+        for _ in range(iterations):
+            pos = _fr_step(pos, edges, k, t)
+            t -= dt
+        return dict(zip(nodes, nx.rescale_layout(pos)))
+
+    def _lbfgs_layout(self, maxiter=50, cutoff=3.0, gravity=0.1):
+        """Minimize a Fruchterman-Reingold style energy with L-BFGS.
+
+        Attraction between adjacent nodes contributes d^3/(3k) (force d^2/k).
+        Repulsion is truncated: only pairs closer than cutoff*k interact, with
+        force k^2/d - k^2/r so it fades to zero at r, and the pairs are found
+        with a KD-tree instead of enumerating all of them. A weak pull towards
+        the centroid keeps isolated nodes and separate components from
+        drifting off. Returns a {node: (x, y)} mapping rescaled to [-1, 1]
+        like nx.spring_layout.
+        """
+        nodes = list(self.G.nodes())
+        n = len(nodes)
+        k = 1.0 / np.sqrt(n)
+        r = cutoff * k
+
+        A = nx.to_scipy_sparse_array(self.G, nodelist=nodes)
+        src, dst = sparse.triu(A, k=1).nonzero()
+
+        # warm start from the previous layout where available
+        rng = np.random.default_rng(42)
+        prev = self._pos_cache or {}
+        x0 = np.array([prev[nd] if nd in prev else rng.random(2) for nd in nodes], dtype=float).ravel()
+
+        def scatter_add(grad, idx, f):
+            grad[:, 0] += np.bincount(idx, weights=f[:, 0], minlength=n)
+            grad[:, 1] += np.bincount(idx, weights=f[:, 1], minlength=n)
+
+        def energy(x):
+            p = x.reshape(n, 2)
+            grad = np.zeros_like(p)
+
+            # attractive term over edges
+            delta = p[src] - p[dst]
+            dist = np.sqrt((delta ** 2).sum(axis=1))
+            e = (dist ** 3).sum() / (3 * k)
+            f = (dist / k)[:, None] * delta
+            scatter_add(grad, src, f)
+            scatter_add(grad, dst, -f)
+
+            # truncated repulsion over pairs closer than r:
+            # -k^2 * (ln(d/r) - d/r + 1), which is zero with zero slope at d = r
+            pairs = spatial.cKDTree(p).query_pairs(r, output_type='ndarray')
+            if len(pairs):
+                iu, ju = pairs[:, 0], pairs[:, 1]
+                delta = p[iu] - p[ju]
+                dist = np.sqrt((delta ** 2).sum(axis=1)) + 1e-9
+                e -= k ** 2 * (np.log(dist / r) - dist / r + 1).sum()
+                f = (k ** 2 * (1 / dist - 1 / r) / dist)[:, None] * delta
+                scatter_add(grad, iu, -f)
+                scatter_add(grad, ju, f)
+
+            # weak quadratic pull towards the centroid
+            offset = p - p.mean(axis=0)
+            e += 0.5 * gravity * (offset ** 2).sum()
+            grad += gravity * offset
+
+            return e, grad.ravel()
+
+        res = optimize.minimize(energy, x0, jac=True, method='L-BFGS-B', options={'maxiter': maxiter})
+        pos_arr = nx.rescale_layout(res.x.reshape(n, 2))
+        return dict(zip(nodes, pos_arr))
+
+    def refresh_graph(self, highlight_odd=False, graph=True, hist=True, three_d=True):
+        """Redraw only the axes whose data changed.
+
+        graph/hist/three_d select the 2D graph, degree histogram and 3D axes.
+        The canvas is repainted once at the end. The edge listbox is kept up
+        to date by the add/remove paths themselves.
+        """
+        # Use a deterministic, sorted node order so UI displays match node ids
+        nodes = self.nodes_sorted()
+        deg_arr = np.array([self._deg.get(n, 0) for n in nodes], dtype=np.int32)
+
+        # Node colors via colormap according to degree, aligned with sorted nodes;
+        # the colormap maps the whole array to an (N, 4) RGBA array in one call
+        node_colors = plt.cm.plasma(deg_arr / deg_arr.max(initial=1))
+
+        # (N, 2) layout coordinates in sorted node order, shared by 2D and 3D
+        self._get_pos()
+        pos_arr = self._pos_soa
+
+        if graph:
+            self._draw_graph_axes(nodes, pos_arr, node_colors, highlight_odd)
+        if three_d and self._show_3d.get():
+            self._draw_3d(nodes, pos_arr, node_colors)
+        if hist:
+            self._draw_hist(nodes, deg_arr)
+
+        self.canvas.draw_idle()
 
+    def _draw_graph_axes(self, nodes, pos_arr, node_colors, highlight_odd=False):
         self.ax1.clear()
-        pos = nx.spring_layout(self.G, seed=42)
-        # Use a deterministic, sorted node order so UI displays match node ids
-        nodes = sorted(list(self.G.nodes()))
-        degrees = {n: self.G.degree(n) for n in nodes}
-
-        # Node colors via colormap according to degree
-        # Node colors via colormap according to degree, aligned with sorted nodes
-        deg_vals = [degrees.get(n, 0) for n in nodes]
-        if deg_vals:
-            maxdeg = max(deg_vals) if max(deg_vals) > 0 else 1
-        else:
-            maxdeg = 1
 
-        cmap = plt.cm.plasma
-        node_colors = [cmap(d / maxdeg) for d in deg_vals]
         edge_color = "#74f7ff"
-
-        # draw nodes/edges using the same 'pos' but ensure nodes are plotted in sorted order
-        nx.draw_networkx_edges(self.G, pos, ax=self.ax1, edge_color=edge_color, alpha=0.9)
-        nx.draw_networkx_nodes(self.G, pos, nodelist=nodes, ax=self.ax1, node_color=node_colors, node_size=900, linewidths=1.2, edgecolors="#0b0b15")
-        nx.draw_networkx_labels(self.G, pos, labels={n: str(n) for n in nodes}, ax=self.ax1, font_color="white")
+        # outline odd-degree vertices in red when verifying the lemma
+        outline = ["#ff6666" if highlight_odd and n in self._odd else "#0b0b15" for n in nodes]
+
+        # draw edges, nodes and labels directly on the axes (bypassing the
+        # nx.draw_networkx_* wrappers), with nodes plotted in sorted order
+        segs2d = pos_arr[self._edge_rows]
+        self.ax1.add_collection(LineCollection(segs2d, colors=edge_color, linewidths=1.0, alpha=0.9, zorder=1))
+        # pad the data limits by 5% like nx.draw_networkx_edges did, so the
+        # large node markers at the edge of the layout are not clipped
+        if len(pos_arr):
+            lo, hi = pos_arr.min(axis=0), pos_arr.max(axis=0)
+            pad = 0.05 * (hi - lo)
+            self.ax1.update_datalim([lo - pad, hi + pad])
+        self.ax1.scatter(pos_arr[:, 0], pos_arr[:, 1], c=node_colors, s=900,
+                         edgecolors=outline, linewidths=1.2, zorder=2)
+        for n, (x, y) in zip(nodes, pos_arr):
+            self.ax1.text(x, y, str(n), color="white", ha="center", va="center", fontsize=12, zorder=3)
 
         self.ax1.set_title("Graph View", color="#cfefff")
         self.ax1.axis('off')
 
-        # 3D view: place nodes on a sphere for a pleasant 3D layout
-        self.ax3.clear()
-        n = len(self.G.nodes())
-        if n > 0:
-            # keep consistent node ordering here as well
-            nodes = sorted(list(self.G.nodes()))
-            # use spring_layout to get 2D coords then lift into 3D
-            pos2d = nx.spring_layout(self.G, seed=42)
-            xs = []
-            ys = []
-            zs = []
-            for i, node in enumerate(nodes):
-                x2, y2 = pos2d.get(node, (0, 0))
-                # map 2D to 3D by adding a z component as small function
-                xs.append(x2)
-                ys.append(y2)
-                zs.append((x2 * y2) * 0.2)
-            # colors from the same colormap (aligned to sorted nodes)
-            deg_vals = [self.G.degree(n) for n in nodes]
-            maxdeg = max(deg_vals) if deg_vals and max(deg_vals) > 0 else 1
-            cmap = plt.cm.plasma
-            node_colors_3d = [cmap(d / maxdeg) for d in deg_vals]
-            self.ax3.scatter(xs, ys, zs, s=140, c=node_colors_3d, depthshade=True, edgecolors='k')
-            # draw simple 3D edges
-            for u, v in self.G.edges():
-                try:
-                    iu = nodes.index(u)
-                    iv = nodes.index(v)
-                except ValueError:
-                    continue
-                self.ax3.plot([xs[iu], xs[iv]], [ys[iu], ys[iv]], [zs[iu], zs[iv]], color='#74f7ff', alpha=0.6)
-        self.ax3.set_title('3D View (move mouse to rotate)', color='#cfefff')
-        self.ax3.set_xticks([])
-        self.ax3.set_yticks([])
-        self.ax3.set_zticks([])
-
-        # Degree histogram (x-axis labelled with actual node ids)
-        self.ax2.clear()
-        deg_values = [degrees.get(n, 0) for n in nodes]
+    def _draw_3d(self, nodes, pos_arr, node_colors):
+        # 3D view: lift the 2D layout into 3D
+        xs = pos_arr[:, 0]
+        ys = pos_arr[:, 1]
+        # map 2D to 3D by adding a z component as small function
+        zs = (xs * ys) * 0.2
+        self._scatter3d._offsets3d = (xs, ys, zs)
+        self._scatter3d.set_facecolor(node_colors)
+        # simple 3D edges as a single collection
+        self._edges3d.set_segments(np.column_stack([xs, ys, zs])[self._edge_rows])
         if nodes:
-            self.ax2.bar(range(len(deg_values)), deg_values, color="#00ffcc", edgecolor="#0b3f3f")
-            # label ticks with node ids instead of 0..n-1
-            self.ax2.set_xticks(range(len(nodes)))
-            self.ax2.set_xticklabels([str(n) for n in nodes], color='white')
+            self.ax3.auto_scale_xyz(xs, ys, zs, had_data=False)
+
+    def _draw_hist(self, nodes, deg_arr):
+        # Degree histogram (x-axis labelled with actual node ids). Bars are only
+        # recreated when the node count changes; otherwise heights are updated.
+        if len(self._bars) != len(nodes):
+            self._bars.remove()
+            self._bars = self.ax2.bar(range(len(deg_arr)), deg_arr, color="#00ffcc", edgecolor="#0b3f3f")
         else:
-            self.ax2.bar([], [])
-        self.ax2.set_title("Degree Distribution", color="white")
-        self.ax2.tick_params(colors="white")
-
-        # Update edge listbox
+            for rect, h in zip(self._bars, deg_arr):
+                rect.set_height(h)
+        # label ticks with node ids instead of 0..n-1
+        self.ax2.set_xticks(range(len(nodes)))
+        self.ax2.set_xticklabels([str(n) for n in nodes], color='white')
+        self.ax2.relim()
+        self.ax2.autoscale_view()
+
+    def _rebuild_edge_list(self):
+        # full rebuild for bulk changes; a single splatted insert is one Tcl call
         self.edge_list.delete(0, tk.END)
-        for u, v in sorted(self.G.edges()):
-            self.edge_list.insert(tk.END, f"{u} - {v}")
-
-        # Update nodes display label
-        self.nodes_display.config(text=f"Nodes: {nodes}")
-
-        self.canvas.draw()
+        self.edge_list.insert(tk.END, *(f"{u} - {v}" for u, v in sorted(self.G.edges())))
 
     def reset_graph(self):
         # Clear DB table and gpickle if present, then reset in-memory graph
-        conn = sqlite3.connect("graph_data.db")
-        c = conn.cursor()
-        c.execute("DELETE FROM edges")
-        conn.commit()
-        conn.close()
+        with transaction(self.conn) as c:
+            c.execute("DELETE FROM edges")
 
         # remove gpickle if exists
         try:
@@ -516,6 +833,12 @@ class GraphApp:
 
         # Reset in-memory graph
         self.G.clear()
+        self.edge_list.delete(0, tk.END)
+        self._deg.clear()
+        self._edge_count = 0
+        self._odd.clear()
+        self._pos_cache = None
+        self._invalidate_cache()
         self.next_node_id = 1
         self.update_node_selectors()
         self.log("🔄 Graph and DB reset. Start from scratch.")
@@ -526,15 +849,17 @@ class GraphApp:
         self.result_label.config(text="Status: —", fg="#ffffff")
         self.refresh_graph()
 
+    def on_close(self):
+        self.conn.close()
+        self.root.destroy()
+
     # ---------- LOGGER ----------
     def log(self, message):
         self.log_box.insert(tk.END, f"{message}\n")
         self.log_box.see(tk.END)
 
     def update_node_selectors(self):
-        nodes = sorted(list(self.G.nodes()))
-        if not nodes:
-            nodes = []
+        nodes = self.nodes_sorted()
         # Update the nodes display label and clear entry boxes if empty
         self.nodes_display.config(text=f"Nodes: {nodes}")
         if not nodes:
@@ -544,7 +869,6 @@ class GraphApp:
 
 # ---------- RUN APP ----------
 if __name__ == "__main__":
-    init_db()
     root = tk.Tk()
     app = GraphApp(root)
     root.mainloop()